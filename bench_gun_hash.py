@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+棍语言哈希后端性能对比
+Created by: ZLaoShi
+Last modified: 2026-10-19 00:00:00 UTC
+"""
+
+import os
+import sys
+import tempfile
+import timeit
+from gun_lang import GunEncoder, HASH_BACKENDS
+
+# 测试样本：短文件名和较长的 Markdown 文本段
+SHORT_NAMES = [f"文件_{i}.txt" for i in range(1000)]
+LONG_SEGMENTS = [f"这是第{i}段较长的 Markdown 正文内容，用于测试长文本的编码速度。" * 20 for i in range(200)]
+
+
+def bench_backend(backend: str, texts, repeat: int = 5) -> float:
+    """返回每次编码的平均耗时（微秒），绕过缓存只计算哈希编码"""
+    history_file = os.path.join(tempfile.gettempdir(), '.gun_bench_history')
+    encoder = GunEncoder(history_file, backend=backend)
+    timer = timeit.Timer(lambda: [encoder.encode_text(text, cache=False) for text in texts])
+    best = min(timer.repeat(repeat=repeat, number=1))
+    return best / len(texts) * 1e6
+
+
+def main():
+    """主函数"""
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    print("| 哈希后端 | 短文件名 (μs/次) | 长文本段 (μs/次) |")
+    print("|----------|------------------|------------------|")
+    for backend in HASH_BACKENDS:
+        short_us = bench_backend(backend, SHORT_NAMES, repeat)
+        long_us = bench_backend(backend, LONG_SEGMENTS, repeat)
+        print(f"| {backend} | {short_us:.2f} | {long_us:.2f} |")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+棍语言编码冲突分析工具
+Created by: ZLaoShi
+Last modified: 2026-10-19 00:00:00 UTC
+"""
+
+import os
+import sys
+from math import expm1, log1p
+from typing import Dict, Iterable, Iterator, Sequence, Set, Tuple
+from gun_converter import GunConverter
+from gun_lang import GunEncoder, parse_scheme_args
+
+# 默认比较的编码位宽
+DEFAULT_WIDTHS = (24, 36, 48)
+
+# 建议位宽时允许的每目录预期冲突数
+DEFAULT_THRESHOLD = 0.01
+
+
+def expected_collisions(n: int, width: int) -> float:
+    """n 个名称均匀散列到 2**width 个编码时，预期与之前名称重复的个数"""
+    if n <= 1:
+        return 0.0
+    m = 2 ** width
+    # n - 预期不同编码数；用 expm1/log1p 避免大位宽下的精度丢失
+    return n + m * expm1(n * log1p(-1 / m))
+
+
+def recommend_width(n: int, widths: Sequence[int] = DEFAULT_WIDTHS,
+                    threshold: float = DEFAULT_THRESHOLD) -> int:
+    """返回预期冲突数低于阈值的最小位宽，都不满足时返回最大位宽"""
+    for width in sorted(widths):
+        if expected_collisions(n, width) < threshold:
+            return width
+    return max(widths)
+
+
+class GunCollisionAnalyzer:
+    """按目录统计不同位宽下转换后文件名的预期和实际冲突"""
+
+    def __init__(self, widths: Sequence[int] = DEFAULT_WIDTHS,
+                 threshold: float = DEFAULT_THRESHOLD, backend: str = GunEncoder.DEFAULT_BACKEND):
+        """初始化分析器"""
+        self.widths = tuple(sorted(widths))
+        self.threshold = threshold
+        self.backend = backend
+        self.converters = {
+            width: GunConverter(width=width, backend=backend) for width in self.widths
+        }
+
+    def _tally(self, name: str, seen: Dict[int, Set[str]], actual: Dict[int, int]) -> bool:
+        """把一个文件名计入某个目录的统计，返回是否参与转换"""
+        # .md 文件不改名，不会产生冲突
+        if name.endswith('.md'):
+            return False
+        for width, converter in self.converters.items():
+            converted = converter.convert_filename(name, cache=False)
+            if converted in seen[width]:
+                actual[width] += 1
+            else:
+                seen[width].add(converted)
+        return True
+
+    def analyze_names(self, names: Iterable[str]) -> Tuple[int, Dict[int, int]]:
+        """统计同一目录下的文件名，不经过编码器缓存，内存只随单个目录的大小增长
+        Returns: (参与转换的文件数, {位宽: 实际冲突数})
+        """
+        seen: Dict[int, Set[str]] = {width: set() for width in self.widths}
+        actual = {width: 0 for width in self.widths}
+        count = sum(self._tally(name, seen, actual) for name in names)
+        return count, actual
+
+    def _stats(self, count: int, actual: Dict[int, int]) -> Dict[int, Tuple[float, int]]:
+        """组合预期冲突数和实际冲突数"""
+        return {
+            width: (expected_collisions(count, width), actual[width])
+            for width in self.widths
+        }
+
+    def _report(self, directory: str, names: Iterable[str]):
+        """生成一个目录的统计结果"""
+        count, actual = self.analyze_names(names)
+        return directory, count, self._stats(count, actual)
+
+    def scan_tree(self, root: str) -> Iterator[Tuple[str, int, Dict[int, Tuple[float, int]]]]:
+        """遍历目录树，逐个目录返回 (目录, 文件数, {位宽: (预期冲突数, 实际冲突数)})"""
+        for directory, _, files in os.walk(root):
+            yield self._report(directory, files)
+
+    def scan_names(self, paths: Iterable[str]) -> Iterator[Tuple[str, int, Dict[int, Tuple[float, int]]]]:
+        """统计路径列表（每行一个路径），按所在目录分组
+        路径可以任意顺序出现（find 会在同一目录的文件之间穿插子目录），
+        每个目录只保存各位宽下转换后的文件名集合，读完输入后逐个目录输出结果
+        """
+        counts: Dict[str, int] = {}
+        seen: Dict[str, Dict[int, Set[str]]] = {}
+        actual: Dict[str, Dict[int, int]] = {}
+        for path in paths:
+            path = path.rstrip('\n')
+            if not path:
+                continue
+            directory, name = os.path.split(path)
+            if directory not in counts:
+                counts[directory] = 0
+                seen[directory] = {width: set() for width in self.widths}
+                actual[directory] = {width: 0 for width in self.widths}
+            counts[directory] += self._tally(name, seen[directory], actual[directory])
+
+        for directory, count in counts.items():
+            yield directory, count, self._stats(count, actual[directory])
+
+    def write_report(self, rows: Iterable[Tuple[str, int, Dict[int, Tuple[float, int]]]], out=None):
+        """输出 Markdown 表格，冲突率为冲突数占文件数的比例"""
+        out = out or sys.stdout
+        header = ' | '.join(f"{width}位 预期/实际" for width in self.widths)
+        out.write("# 编码冲突分析\n\n")
+        out.write(f"哈希后端: {self.backend}\n\n")
+        out.write(f"| 目录 | 文件数 | {header} | 建议位宽 |\n")
+        out.write("|------|--------|" + "--------------|" * len(self.widths) + "----------|\n")
+        for directory, count, stats in rows:
+            if count == 0:
+                continue
+            cells = ' | '.join(
+                f"{expected / count:.4%} / {actual / count:.4%}"
+                for expected, actual in (stats[width] for width in self.widths)
+            )
+            width = recommend_width(count, self.widths, self.threshold)
+            out.write(f"| {directory} | {count} | {cells} | {width} |\n")
+
+
+def main():
+    """主函数"""
+    if len(sys.argv) < 2:
+        print("使用方法: python3 gun_collision.py <directory|-> [width ...] [backend]（顺序任意）")
+        print("  使用 - 时从标准输入读取路径列表（每行一个）")
+        return
+
+    try:
+        widths, backend = parse_scheme_args(sys.argv[2:])
+        analyzer = GunCollisionAnalyzer(widths or DEFAULT_WIDTHS, backend=backend)
+    except ValueError as e:
+        print(f"错误：{str(e)}")
+        return
+
+    target = sys.argv[1]
+    if target == '-':
+        rows = analyzer.scan_names(sys.stdin)
+    elif os.path.isdir(target):
+        rows = analyzer.scan_tree(target)
+    else:
+        print(f"错误：{target} 不是一个有效的目录")
+        return
+
+    analyzer.write_report(rows)
+
+if __name__ == "__main__":
+    main()
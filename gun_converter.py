@@ -11,14 +11,19 @@ import os
 import re
 import platform
 from typing import List, Tuple, Dict
-from gun_lang import GunEncoder
+from gun_lang import GunEncoder, encoder_options
 
 class GunConverter:
     """棍语言文件转换器类"""
     
-    def __init__(self):
-        """初始化转换器"""
-        self.encoder = GunEncoder()
+    def __init__(self, cache_file: str = None, width: int = GunEncoder.DEFAULT_WIDTH,
+                 backend: str = GunEncoder.DEFAULT_BACKEND):
+        """初始化转换器
+        cache_file: 多进程共享的编码缓存文件，为 None 时不使用
+        width: 编码位宽，文件较多的目录可用更大的位宽避免重名
+        backend: 哈希后端
+        """
+        self.encoder = GunEncoder(cache_file=cache_file, width=width, backend=backend)
         self.processed_files: Dict[str, Tuple[str, str]] = {}  # 记录处理过的文件
         # 检测操作系统类型
         self.is_windows = platform.system().lower() == 'windows'
@@ -46,6 +51,8 @@ class GunConverter:
         """
         results = []
         for root, dirs, files in os.walk(directory):
+            # 每个目录的文件名批量编码
+            converted_names = self.convert_filenames(files)
             for file in files:
                 original_path = os.path.join(root, file)
                 if file.endswith('.md'):
@@ -54,7 +61,7 @@ class GunConverter:
                     results.append((original_path, original_path, file))
                 else:
                     # 转换非 .md 文件名
-                    converted_name = self.convert_filename(file)
+                    converted_name = converted_names[file]
                     # 应用平台特定的文件名清理
                     converted_name = self.sanitize_filename(converted_name)
                     converted_path = os.path.join(root, converted_name)
@@ -84,27 +91,48 @@ class GunConverter:
         
         return results
     
-    def convert_filename(self, filename: str) -> str:
-        """转换文件名为棍语言，保留点号但转换扩展名"""
+    @staticmethod
+    def _filename_texts(name: str, ext: str) -> List[str]:
+        """文件名中需要编码的部分：主文件名和去掉点号的扩展名"""
+        return [name, ext[1:]] if ext[1:] else [name]
+    
+    @staticmethod
+    def _join_filename(name: str, ext: str, codes: Dict[str, Tuple[str, str]]) -> str:
+        """用编码结果组合转换后的文件名，保留点号但转换扩展名"""
+        if ext[1:]:  # 如果扩展名非空
+            ext = '.' + codes[ext[1:]][1]
+        return codes[name][1] + ext
+    
+    def convert_filename(self, filename: str, cache: bool = True) -> str:
+        """转换文件名为棍语言，保留点号但转换扩展名
+        cache: 为 False 时直接计算编码，不读写任何缓存
+        """
         if filename.endswith('.md'):
             return filename
         
         # 分离文件名和扩展名（包含点号）
         name, ext = os.path.splitext(filename)
-        
-        # 如果有扩展名（ext包含点号）
-        if ext:
-            # 保留点号，但转换扩展名中除点号外的部分
-            dot_ext = ext[1:]  # 去掉点号
-            if dot_ext:  # 如果扩展名非空
-                _, gun_ext = self.encoder.encode_text(dot_ext)
-                ext = '.' + gun_ext  # 重新加上点号
-        
-        # 转换主文件名
-        _, gun_name = self.encoder.encode_text(name)
-        
-        # 组合转换后的文件名和扩展名
-        return gun_name + ext
+        codes = {
+            text: self.encoder.encode_text(text, cache=cache)
+            for text in self._filename_texts(name, ext)
+        }
+        return self._join_filename(name, ext, codes)
+    
+    def convert_filenames(self, filenames: List[str], cache: bool = True) -> Dict[str, str]:
+        """批量转换同一批文件名，共享缓存只查询和写入一次
+        cache: 为 False 时直接计算编码，不读写任何缓存（用于只读的统计分析）
+        Returns: {原文件名: 转换后文件名}
+        """
+        parts = {f: os.path.splitext(f) for f in filenames if not f.endswith('.md')}
+        texts = (text for name, ext in parts.values() for text in self._filename_texts(name, ext))
+        if cache:
+            codes = self.encoder.encode_batch(texts)
+        else:
+            codes = {text: self.encoder.encode_text(text, cache=False) for text in dict.fromkeys(texts)}
+        converted = {f: f for f in filenames}
+        for f, (name, ext) in parts.items():
+            converted[f] = self._join_filename(name, ext, codes)
+        return converted
     
     def process_markdown_file(self, file_path: str) -> List[Tuple[str, str, int]]:
         """处理 Markdown 文件
@@ -168,6 +196,7 @@ class GunConverter:
         
         with open(output_file, 'w', encoding='utf-8') as f:
             f.write("# 文件名映射关系\n\n")
+            f.write(f"编码方案: {self.encoder.scheme}\n\n")
             f.write("| 原始文件名 | 转换后文件名 | 说明 |\n")
             f.write("|------------|--------------|------|\n")
             
@@ -181,8 +210,8 @@ def main():
     """主函数"""
     import sys
     
-    if len(sys.argv) != 2:
-        print("使用方法: python3 gun_converter.py <directory>")
+    if len(sys.argv) not in (2, 3, 4):
+        print("使用方法: python3 gun_converter.py <directory> [width] [backend]（顺序任意）")
         return
     
     directory = sys.argv[1]
@@ -190,7 +219,11 @@ def main():
         print(f"错误：{directory} 不是一个有效的目录")
         return
     
-    converter = GunConverter()
+    try:
+        converter = GunConverter(**encoder_options(sys.argv[2:]))
+    except ValueError as e:
+        print(f"错误：{str(e)}")
+        return
     
     try:
         # 创建映射文件
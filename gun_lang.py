@@ -10,8 +10,34 @@ Last modified: 2025-03-06 17:50:59 UTC
 import hashlib
 import os
 import sys
+import zlib
 from datetime import datetime, timezone
-from typing import Dict, Optional, Tuple
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from gun_store import GunStore, locked
+
+def _md5_bits(data: bytes, bits: int) -> int:
+    """MD5 摘要的前 bits 位"""
+    return int.from_bytes(hashlib.md5(data).digest(), 'big') >> (128 - bits)
+
+def _blake2b_bits(data: bytes, bits: int) -> int:
+    """BLAKE2b 摘要的前 bits 位，摘要长度按需取最小字节数"""
+    size = (bits + 7) // 8
+    return int.from_bytes(hashlib.blake2b(data, digest_size=size).digest(), 'big') >> (size * 8 - bits)
+
+def _crc32_bits(data: bytes, bits: int) -> int:
+    """CRC32 校验值的前 bits 位（非加密哈希，速度最快）"""
+    return zlib.crc32(data) >> (32 - bits)
+
+# 可选的哈希后端：名称 => (最大位数, 取前 n 位的函数)
+HASH_BACKENDS: Dict[str, Tuple[int, Callable[[bytes, int], int]]] = {
+    'md5': (128, _md5_bits),
+    'blake2b': (512, _blake2b_bits),
+    'crc32': (32, _crc32_bits),
+}
+
+# 命令行工具默认使用的共享缓存文件
+DEFAULT_CACHE_FILE = "~/.gun_cache.db"
 
 class GunEncoder:
     """棍语言编码器类"""
@@ -31,8 +57,31 @@ class GunEncoder:
     # 反向映射
     REVERSE_MAP = {v: k for k, v in CHAR_MAP.items()}
     
-    def __init__(self, history_file: str = None):
-        """初始化编码器"""
+    # 默认编码位宽（二进制位数），每3位对应一位八进制
+    DEFAULT_WIDTH = 24
+    
+    # 默认哈希后端，与旧版本编码结果兼容
+    DEFAULT_BACKEND = 'md5'
+    
+    # 进程内缓存的最大条目数，超出后淘汰最久未使用的记录
+    MEMO_SIZE = 4096
+    
+    def __init__(self, history_file: str = None, cache_file: str = None,
+                 width: int = DEFAULT_WIDTH, backend: str = DEFAULT_BACKEND):
+        """初始化编码器
+        cache_file: 多进程共享的编码缓存（SQLite），为 None 时只使用进程内缓存
+        width: 编码位宽，必须是3的倍数，例如 24/36/48
+        backend: 哈希后端，见 HASH_BACKENDS
+        """
+        if backend not in HASH_BACKENDS:
+            raise ValueError(f"未知的哈希后端：{backend}，可选：{', '.join(HASH_BACKENDS)}")
+        max_width, self._hash_bits = HASH_BACKENDS[backend]
+        max_width -= max_width % 3
+        if width <= 0 or width > max_width or width % 3:
+            raise ValueError(f"{backend} 的编码位宽必须是 3 到 {max_width} 之间的 3 的倍数：{width}")
+        self.backend = backend
+        self.width = width
+        
         if history_file is None:
             self.history_file = os.path.expanduser("~/.gun_history")
         else:
@@ -40,25 +89,29 @@ class GunEncoder:
         
         # 确保历史记录目录存在
         os.makedirs(os.path.dirname(self.history_file), exist_ok=True)
+        
+        self.store = GunStore(cache_file) if cache_file is not None else None
+        self._memo: 'OrderedDict[str, Tuple[str, str]]' = OrderedDict()
+    
+    @property
+    def scheme(self) -> str:
+        """编码方案标识，用作共享缓存的键并记录在历史和映射文档中"""
+        return f'{self.backend}-{self.width}'
+    
+    @property
+    def digits(self) -> int:
+        """主编码的八进制位数"""
+        return self.width // 3
     
-    def _md5_to_binary(self, text: str) -> str:
-        """将文本转换为MD5哈希，然后转换为二进制，确保生成24位二进制"""
-        md5_hash = hashlib.md5(text.encode()).hexdigest()
-        binary = ''
-        # 修改：只取前6个字符，因为每个十六进制字符产生4位二进制
-        # 6个十六进制字符 * 4位二进制 = 24位二进制
-        # 24位二进制刚好可以生成8个三位组（用于八进制）
-        for i in range(6):  # 改为6，而不是8
-            hex_char = md5_hash[i]
-            bin_str = bin(int(hex_char, 16))[2:].zfill(4)
-            binary += bin_str
-        return binary[:24]  # 确保只有24位
+    def _hash_to_binary(self, text: str) -> str:
+        """将文本哈希，取前 width 位作为二进制"""
+        value = self._hash_bits(text.encode(), self.width)
+        return bin(value)[2:].zfill(self.width)
 
     def _binary_to_octal(self, binary: str) -> str:
-        """将24位二进制转换为8位八进制"""
+        """将二进制转换为八进制，每3位二进制对应1位八进制"""
         octal = ''
-        # 每3位二进制转换为1位八进制
-        for i in range(0, 24, 3):
+        for i in range(0, len(binary), 3):
             group = binary[i:i+3]
             if len(group) < 3:  # 处理最后一组可能不足3位的情况
                 group = group.ljust(3, '0')
@@ -66,8 +119,59 @@ class GunEncoder:
             octal += str(val)
         return octal
     
-    def encode_text(self, text: str) -> Tuple[str, str]:
-        """编码文本为棍语言"""
+    def _remember(self, text: str, result: Tuple[str, str]):
+        """写入进程内缓存，超出 MEMO_SIZE 时淘汰最久未使用的记录"""
+        self._memo[text] = result
+        self._memo.move_to_end(text)
+        if len(self._memo) > self.MEMO_SIZE:
+            self._memo.popitem(last=False)
+    
+    def encode_text(self, text: str, cache: bool = True) -> Tuple[str, str]:
+        """编码文本为棍语言，只使用进程内缓存（Markdown 内容等一次性文本不写入共享缓存）
+        cache: 为 False 时直接计算，不读写任何缓存
+        """
+        if not cache:
+            return self._encode(text)
+        
+        result = self._memo.get(text)
+        if result is not None:
+            self._memo.move_to_end(text)
+            return result
+        
+        result = self._encode(text)
+        self._remember(text, result)
+        return result
+    
+    def encode_batch(self, texts: Iterable[str]) -> Dict[str, Tuple[str, str]]:
+        """批量编码文件名等可复用的文本，共享缓存只查询和写入各一次
+        Returns: {text: (octal, gun_code)}
+        """
+        results: Dict[str, Tuple[str, str]] = {}
+        missing = []
+        for text in dict.fromkeys(texts):
+            result = self._memo.get(text)
+            if result is not None:
+                results[text] = result
+            else:
+                missing.append(text)
+        
+        if self.store is not None and missing:
+            found = self.store.get_many(self.scheme, missing)
+            results.update(found)
+            missing = [text for text in missing if text not in found]
+        
+        computed = [(text, *self._encode(text)) for text in missing]
+        for text, octal, gun_code in computed:
+            results[text] = (octal, gun_code)
+        if self.store is not None:
+            self.store.put_many(self.scheme, computed)
+        
+        for text, result in results.items():
+            self._remember(text, result)
+        return results
+    
+    def _encode(self, text: str) -> Tuple[str, str]:
+        """计算文本的棍语言编码"""
         # 检查是否是.md文件
         if text.endswith('.md'):
             extension = '.md'
@@ -78,13 +182,13 @@ class GunEncoder:
             if '.' in text:
                 base, ext = text.rsplit('.', 1)
                 main_text = base
-                # 对扩展名进行编码
-                ext_hash = hashlib.md5(ext.encode()).hexdigest()
-                ext_code = f".{int(ext_hash[0], 16) % 8}{int(ext_hash[1], 16) % 8}"
+                # 对扩展名进行编码：取哈希前8位，高低4位各模8
+                ext_hash = self._hash_bits(ext.encode(), 8)
+                ext_code = f".{(ext_hash >> 4) % 8}{(ext_hash & 0xf) % 8}"
                 extension = ext_code
         
         # 生成二进制
-        binary = self._md5_to_binary(main_text)
+        binary = self._hash_to_binary(main_text)
         
         # 转换为八进制
         octal = self._binary_to_octal(binary)
@@ -111,6 +215,8 @@ class GunEncoder:
             extension = ''
         
         # 转换主要部分
+        if len(main_code) != self.digits:
+            raise ValueError(f"棍语言码长度应为{self.digits}位（{self.width}位宽），实际为{len(main_code)}位")
         octal = ''.join(self.REVERSE_MAP.get(c, c) for c in main_code)
         
         # 如果有扩展名，添加回来
@@ -122,25 +228,35 @@ class GunEncoder:
     def add_history(self, text: str, octal: str, gun_code: str):
         """添加到历史记录"""
         timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S UTC")
+        record = (
+            '---\n'
+            f'时间: {timestamp}\n'
+            f'文本: {text}\n'
+            f'八进制: {octal}\n'
+            f'棍语言: {gun_code}\n'
+            f'方案: {self.scheme}\n'
+        )
         
-        with open(self.history_file, 'a', encoding='utf-8') as f:
-            f.write('---\n')
-            f.write(f'时间: {timestamp}\n')
-            f.write(f'文本: {text}\n')
-            f.write(f'八进制: {octal}\n')
-            f.write(f'棍语言: {gun_code}\n')
+        # 加排他锁后一次性写入，避免多个进程的记录交错
+        with open(self.history_file, 'a', encoding='utf-8') as f, locked(f):
+            f.write(record)
+            f.flush()
     
     def search_history(self, octal: str) -> Optional[str]:
-        """搜索历史记录"""
+        """搜索当前编码方案下的历史记录，没有方案字段的旧记录视为 md5-24"""
         if not os.path.exists(self.history_file):
             return None
+        
+        legacy = self.scheme == f'{self.DEFAULT_BACKEND}-{self.DEFAULT_WIDTH}'
             
-        with open(self.history_file, 'r', encoding='utf-8') as f:
+        with open(self.history_file, 'r', encoding='utf-8') as f, locked(f, exclusive=False):
             content = f.read()
             records = content.split('---\n')
             
             for record in records:
-                if f'八进制: {octal}\n' in record:
+                if f'八进制: {octal}\n' not in record:
+                    continue
+                if f'方案: {self.scheme}\n' in record or (legacy and '方案: ' not in record):
                     return '---\n' + record.strip()
         
         return None
@@ -154,7 +270,7 @@ class GunEncoder:
         print("编码历史记录：")
         count = 0
         
-        with open(self.history_file, 'r', encoding='utf-8') as f:
+        with open(self.history_file, 'r', encoding='utf-8') as f, locked(f, exclusive=False):
             content = f.read()
             records = content.split('---\n')
             
@@ -169,21 +285,51 @@ class GunEncoder:
             print(f"\n共找到 {count} 条记录")
     
     def clear_history(self):
-        """清空历史记录"""
+        """清空历史记录，加排他锁后截断而不是删除文件，避免并发写入的记录丢失"""
         if os.path.exists(self.history_file):
-            os.remove(self.history_file)
+            with open(self.history_file, 'a', encoding='utf-8') as f, locked(f):
+                f.truncate(0)
             print("历史记录已清空")
 
+def parse_scheme_args(args: List[str]) -> Tuple[List[int], str]:
+    """解析命令行中的位宽和哈希后端参数，顺序任意：数字为位宽，其余为哈希后端
+    Returns: (位宽列表, 哈希后端)
+    """
+    widths = [int(arg) for arg in args if arg.isdigit()]
+    backends = [arg for arg in args if not arg.isdigit()]
+    if len(backends) > 1:
+        raise ValueError(f"只能指定一个哈希后端：{', '.join(backends)}")
+    backend = backends[0] if backends else GunEncoder.DEFAULT_BACKEND
+    if backend not in HASH_BACKENDS:
+        raise ValueError(f"未知的哈希后端：{backend}，可选：{', '.join(HASH_BACKENDS)}")
+    return widths, backend
+
+def encoder_options(args: List[str]) -> Dict[str, object]:
+    """解析命令行参数，返回 GunEncoder / GunConverter 的关键字参数（使用共享缓存）"""
+    widths, backend = parse_scheme_args(args)
+    if len(widths) > 1:
+        raise ValueError(f"只能指定一个位宽：{', '.join(map(str, widths))}")
+    return {
+        'cache_file': os.path.expanduser(DEFAULT_CACHE_FILE),
+        'width': widths[0] if widths else GunEncoder.DEFAULT_WIDTH,
+        'backend': backend,
+    }
+
 def main():
     """主函数"""
-    encoder = GunEncoder()
-    
     if len(sys.argv) < 2:
         show_usage()
         return
     
     command = sys.argv[1]
     
+    # 可选的编码位宽和哈希后端参数
+    try:
+        encoder = GunEncoder(**encoder_options(sys.argv[2:]))
+    except ValueError as e:
+        print(f"错误：{str(e)}")
+        return
+    
     if command == "encode-text":
         print("请输入要编码的文本（支持中文）：")
         text = input().strip()
@@ -201,12 +347,17 @@ def main():
         
     elif command == "decode":
         print("请输入棍语言代码：")
-        gun_code = input().strip()
-        if not gun_code:
+        # 数字0编码为空格，只去掉换行符，保留首尾空格
+        gun_code = input().rstrip('\r\n')
+        if not gun_code.strip():
             print("错误：输入不能为空")
             return
             
-        octal = encoder.decode_text(gun_code)
+        try:
+            octal = encoder.decode_text(gun_code)
+        except ValueError as e:
+            print(f"错误：{str(e)}")
+            return
         print("\n解码结果：")
         print(f"棍语言码: {gun_code}")
         print(f"八进制值: {octal}")
@@ -234,12 +385,16 @@ def main():
 def show_usage():
     """显示使用方法"""
     print(f"""棍语言编码器 v3.0 - 使用方法：
-    编码文本:     {sys.argv[0]} encode-text
-    解码:         {sys.argv[0]} decode
+    编码文本:     {sys.argv[0]} encode-text [位宽] [哈希后端]
+    解码:         {sys.argv[0]} decode [位宽] [哈希后端]
+    （位宽和哈希后端都可省略，顺序任意）
     显示历史:     {sys.argv[0]} history
     清空历史:     {sys.argv[0]} clear-history
     查看帮助:     {sys.argv[0]} help
 
+位宽为编码的二进制位数，必须是3的倍数（默认24，可选36、48等）
+哈希后端可选 {', '.join(HASH_BACKENDS)}（默认md5；crc32 最大30位）
+
 字符映射关系：
     0 => [空格]
     1 => I（大写字母I）
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+棍语言多进程共享存储
+Created by: ZLaoShi
+Last modified: 2026-10-19 00:00:00 UTC
+"""
+
+import os
+import sqlite3
+from contextlib import contextmanager
+from typing import IO, Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows 没有 fcntl
+    fcntl = None
+
+
+@contextmanager
+def locked(f: IO, exclusive: bool = True) -> Iterator[IO]:
+    """对已打开的文件加 fcntl 锁，exclusive=False 时为共享锁（Windows 下不加锁）"""
+    if fcntl is None:
+        yield f
+        return
+    fcntl.flock(f.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+    try:
+        yield f
+    finally:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+@contextmanager
+def file_lock(path: str, exclusive: bool = True) -> Iterator[None]:
+    """对锁文件加 fcntl 锁"""
+    with open(path, 'a') as f, locked(f, exclusive):
+        yield
+
+
+class GunStore:
+    """基于 SQLite (WAL 模式) 的编码缓存，多个进程可同时读，写入由 fcntl 锁串行化"""
+
+    # 每条 SELECT 查询的最大参数个数（SQLite 默认上限为 999）
+    QUERY_CHUNK = 500
+
+    # 缓存的最大记录数，超出后删除最早写入的记录
+    MAX_ROWS = 100000
+
+    def __init__(self, db_file: str = None, max_rows: int = MAX_ROWS):
+        """初始化存储"""
+        self.max_rows = max_rows
+        if db_file is None:
+            self.db_file = os.path.expanduser("~/.gun_cache.db")
+        else:
+            self.db_file = db_file
+        self.lock_file = self.db_file + '.lock'
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_file)), exist_ok=True)
+
+    def _connect(self) -> sqlite3.Connection:
+        """获取当前进程的连接（fork 之后的子进程会重新连接）"""
+        if self._conn is not None and self._pid == os.getpid():
+            return self._conn
+
+        # 切换 WAL 和建表都需要写锁
+        with file_lock(self.lock_file):
+            conn = sqlite3.connect(self.db_file, timeout=30)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS encodings ('
+                'scheme TEXT NOT NULL, '
+                'text TEXT NOT NULL, '
+                'octal TEXT NOT NULL, '
+                'gun_code TEXT NOT NULL, '
+                'PRIMARY KEY (scheme, text))'
+            )
+            conn.commit()
+
+        self._conn = conn
+        self._pid = os.getpid()
+        return conn
+
+    def get_many(self, scheme: str, texts: Iterable[str]) -> Dict[str, Tuple[str, str]]:
+        """批量查找缓存的编码结果，返回 {text: (octal, gun_code)}，未命中的不在结果中"""
+        conn = self._connect()
+        texts = list(dict.fromkeys(texts))
+        found: Dict[str, Tuple[str, str]] = {}
+        for i in range(0, len(texts), self.QUERY_CHUNK):
+            chunk = texts[i:i + self.QUERY_CHUNK]
+            rows = conn.execute(
+                'SELECT text, octal, gun_code FROM encodings '
+                f'WHERE scheme = ? AND text IN ({", ".join("?" * len(chunk))})',
+                [scheme] + chunk
+            )
+            for text, octal, gun_code in rows:
+                found[text] = (octal, gun_code)
+        return found
+
+    def put_many(self, scheme: str, rows: List[Tuple[str, str, str]]):
+        """在一个加锁事务中批量写入 (text, octal, gun_code)，已存在的记录保持不变"""
+        if not rows:
+            return
+        conn = self._connect()
+        with file_lock(self.lock_file):
+            conn.executemany(
+                'INSERT OR IGNORE INTO encodings (scheme, text, octal, gun_code) '
+                'VALUES (?, ?, ?, ?)',
+                [(scheme, text, octal, gun_code) for text, octal, gun_code in rows]
+            )
+            # rowid 按写入顺序递增，只保留最近写入的 max_rows 条
+            conn.execute(
+                'DELETE FROM encodings WHERE rowid <= (SELECT MAX(rowid) FROM encodings) - ?',
+                (self.max_rows,)
+            )
+            conn.commit()
+
+    def count(self) -> int:
+        """返回缓存记录数"""
+        return self._connect().execute('SELECT COUNT(*) FROM encodings').fetchone()[0]
+
+    def close(self):
+        """关闭连接"""
+        if self._conn is not None and self._pid == os.getpid():
+            self._conn.close()
+        self._conn = None
+        self._pid = None
@@ -8,13 +8,14 @@ Last modified: 2025-03-06 18:46:39 UTC
 """
 
 from gun_converter import GunConverter
+from gun_lang import encoder_options
 import sys
 import os
 
 def main():
     """主程序入口"""
-    if len(sys.argv) != 2:
-        print("使用方法: gun_converter <directory>")
+    if len(sys.argv) not in (2, 3, 4):
+        print("使用方法: gun_converter <directory> [width] [backend]（顺序任意）")
         return
 
     directory = sys.argv[1]
@@ -22,7 +23,12 @@ def main():
         print(f"错误：{directory} 不是有效目录")
         return
 
-    converter = GunConverter()
+    try:
+        converter = GunConverter(**encoder_options(sys.argv[2:]))
+    except ValueError as e:
+        print(f"错误：{str(e)}")
+        return
+
     converter.create_name_mapping(directory)
     print(f"转换完成，映射关系已保存到 name_mapping.md")
 
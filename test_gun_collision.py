@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+棍语言编码冲突分析测试套件
+Created by: ZLaoShi
+Last modified: 2026-10-19 00:00:00 UTC
+"""
+
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from gun_collision import GunCollisionAnalyzer, expected_collisions, recommend_width
+
+class TestGunCollision(unittest.TestCase):
+    """测试编码冲突分析"""
+
+    def setUp(self):
+        """测试前设置"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.analyzer = GunCollisionAnalyzer((24, 36))
+
+    def tearDown(self):
+        """测试后清理"""
+        shutil.rmtree(self.temp_dir)
+
+    def test_expected_collisions(self):
+        """测试预期冲突数"""
+        self.assertEqual(expected_collisions(1, 24), 0.0)
+        # 生日问题：约 4096 个名称时 24 位编码预期约有 0.5 个冲突
+        self.assertAlmostEqual(expected_collisions(4096, 24), 0.5, delta=0.01)
+        self.assertLess(expected_collisions(4096, 48), 1e-6)
+
+    def test_recommend_width(self):
+        """测试位宽建议"""
+        self.assertEqual(recommend_width(10), 24)
+        self.assertEqual(recommend_width(5000), 36)
+        self.assertEqual(recommend_width(10 ** 9, (24, 36)), 36)
+
+    def test_actual_collisions(self):
+        """测试实际冲突统计"""
+        names = [f"file_{i}.txt" for i in range(20000)] + ["readme.md"]
+        count, actual = self.analyzer.analyze_names(names)
+        self.assertEqual(count, 20000)
+        self.assertGreater(actual[24], 0)
+        self.assertEqual(actual[36], 0)
+
+        # 统计不经过编码器缓存
+        for converter in self.analyzer.converters.values():
+            self.assertEqual(len(converter.encoder._memo), 0)
+
+    def test_scan_tree_and_names(self):
+        """测试目录树和路径列表的统计一致"""
+        os.makedirs(os.path.join(self.temp_dir, "subdir"))
+        for path in ("a.txt", "b.txt", os.path.join("subdir", "c.txt")):
+            with open(os.path.join(self.temp_dir, path), 'w', encoding='utf-8') as f:
+                f.write("test")
+
+        tree = {d: n for d, n, _ in self.analyzer.scan_tree(self.temp_dir)}
+        self.assertEqual(tree[self.temp_dir], 2)
+        self.assertEqual(tree[os.path.join(self.temp_dir, "subdir")], 1)
+
+        paths = [os.path.join(self.temp_dir, p) + '\n' for p in ("a.txt", "b.txt", os.path.join("subdir", "c.txt"))]
+        names = {d: n for d, n, _ in self.analyzer.scan_names(paths)}
+        self.assertEqual(names, tree)
+
+        # 同一目录的路径被子目录隔开时仍合并统计
+        interleaved = [os.path.join("a", "x.txt"), os.path.join("a", "sub", "y.txt"), os.path.join("a", "z.txt")]
+        rows = {d: n for d, n, _ in self.analyzer.scan_names(p + '\n' for p in interleaved)}
+        self.assertEqual(rows, {"a": 2, os.path.join("a", "sub"): 1})
+
+        out = io.StringIO()
+        self.analyzer.write_report(self.analyzer.scan_tree(self.temp_dir), out)
+        self.assertIn("哈希后端: md5", out.getvalue())
+        self.assertIn("| 目录 | 文件数 | 24位 预期/实际 | 36位 预期/实际 | 建议位宽 |", out.getvalue())
+
+    def test_backend(self):
+        """测试按指定哈希后端统计"""
+        analyzer = GunCollisionAnalyzer((24,), backend='crc32')
+        self.assertEqual(analyzer.converters[24].encoder.scheme, 'crc32-24')
+        with self.assertRaises(ValueError):
+            GunCollisionAnalyzer((36,), backend='crc32')
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
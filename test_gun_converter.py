@@ -93,6 +93,7 @@ class TestGunConverter(unittest.TestCase):
         with open(mapping_file, 'r', encoding='utf-8') as f:
             content = f.read()
             self.assertIn("| 原始文件名 | 转换后文件名 | 说明 |", content)
+            self.assertIn("编码方案: md5-24", content)
 
 def run_tests():
     """运行所有测试"""
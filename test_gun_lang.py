@@ -10,7 +10,7 @@ Last modified: 2025-03-06 17:52:49 UTC
 import os
 import tempfile
 import unittest
-from gun_lang import GunEncoder
+from gun_lang import GunEncoder, HASH_BACKENDS, encoder_options, parse_scheme_args
 
 class TestGunEncoder(unittest.TestCase):
     """测试棍语言编码器的所有功能"""
@@ -84,9 +84,25 @@ class TestGunEncoder(unittest.TestCase):
         self.assertIsNotNone(result)
         self.assertIn(text, result)
         
-        # 测试清空历史记录
+        # 测试清空历史记录（截断文件而不是删除）
         self.encoder.clear_history()
-        self.assertFalse(os.path.exists(self.history_file))
+        self.assertEqual(os.path.getsize(self.history_file), 0)
+        self.assertIsNone(self.encoder.search_history(octal))
+
+    def test_memo_is_bounded(self):
+        """测试进程内缓存有上限"""
+        for i in range(GunEncoder.MEMO_SIZE + 100):
+            self.encoder.encode_text(f"name_{i}")
+        self.assertEqual(len(self.encoder._memo), GunEncoder.MEMO_SIZE)
+        self.assertNotIn("name_0", self.encoder._memo)
+
+    def test_encode_batch(self):
+        """测试批量编码与逐个编码结果一致"""
+        texts = ["a.txt", "测试", "a.txt", "b"]
+        results = self.encoder.encode_batch(texts)
+        self.assertEqual(set(results), {"a.txt", "测试", "b"})
+        for text in texts:
+            self.assertEqual(results[text], GunEncoder(self.history_file).encode_text(text))
 
     def test_chinese_text(self):
         """测试中文文本"""
@@ -110,6 +126,75 @@ class TestGunEncoder(unittest.TestCase):
         self.assertEqual(len(main_gun), 8, 
                         f"棍语言主要部分长度应为8位，实际为{len(main_gun)}位: {main_gun}")
 
+    def test_wider_codes(self):
+        """测试更宽的编码位宽"""
+        narrow_octal, _ = self.encoder.encode_text("test.txt")
+        for width in (36, 48):
+            encoder = GunEncoder(self.history_file, width=width)
+            octal, gun_code = encoder.encode_text("test.txt")
+            main_octal = octal.split('.')[0]
+            self.assertEqual(len(main_octal), width // 3)
+            # 宽编码的前缀与24位编码一致
+            self.assertTrue(main_octal.startswith(narrow_octal.split('.')[0]))
+            self.assertEqual(encoder.decode_text(gun_code).split('.')[0], main_octal)
+
+    def test_invalid_width(self):
+        """测试非法位宽"""
+        for width in (0, 25, 129):
+            with self.assertRaises(ValueError):
+                GunEncoder(self.history_file, width=width)
+
+    def test_decode_width_mismatch(self):
+        """测试解码长度与位宽不符"""
+        encoder = GunEncoder(self.history_file, width=36)
+        with self.assertRaises(ValueError):
+            encoder.decode_text("Il|∣╸⏐｜ ")
+
+    def test_hash_backends(self):
+        """测试不同哈希后端"""
+        for backend in HASH_BACKENDS:
+            encoder = GunEncoder(self.history_file, backend=backend)
+            self.assertEqual(encoder.scheme, f'{backend}-24')
+            octal, gun_code = encoder.encode_text("测试文本.txt")
+            self.assertEqual(len(octal.split('.')[0]), 8)
+            self.assertEqual(len(octal.split('.')[1]), 2)
+            self.assertEqual(encoder.encode_text("测试文本.txt"), (octal, gun_code))
+        self.assertNotEqual(GunEncoder(self.history_file, backend='blake2b').encode_text("test"),
+                            self.encoder.encode_text("test"))
+
+    def test_invalid_backend(self):
+        """测试未知哈希后端和超出后端位数的位宽"""
+        with self.assertRaises(ValueError):
+            GunEncoder(self.history_file, backend='sha1')
+        with self.assertRaisesRegex(ValueError, "3 到 30 之间"):
+            GunEncoder(self.history_file, width=33, backend='crc32')
+
+    def test_parse_scheme_args(self):
+        """测试命令行位宽和哈希后端参数，顺序任意"""
+        self.assertEqual(parse_scheme_args([]), ([], 'md5'))
+        self.assertEqual(parse_scheme_args(['blake2b']), ([], 'blake2b'))
+        self.assertEqual(parse_scheme_args(['crc32', '24', '18']), ([24, 18], 'crc32'))
+        options = encoder_options(['crc32', '24'])
+        self.assertEqual((options['width'], options['backend']), (24, 'crc32'))
+        self.assertEqual(encoder_options([])['width'], GunEncoder.DEFAULT_WIDTH)
+        for args in (['md5', 'crc32'], ['sha1'], ['24', '36']):
+            with self.assertRaises(ValueError):
+                encoder_options(args)
+
+    def test_history_records_backend(self):
+        """测试历史记录只匹配相同编码方案"""
+        encoder = GunEncoder(self.history_file, backend='crc32')
+        octal, gun_code = encoder.encode_text("test")
+        encoder.add_history("test", octal, gun_code)
+        self.assertIn('方案: crc32-24', encoder.search_history(octal))
+        self.assertIsNone(self.encoder.search_history(octal))
+
+        # 没有方案字段的旧记录视为 md5-24
+        with open(self.history_file, 'a', encoding='utf-8') as f:
+            f.write('---\n时间: -\n文本: old\n八进制: 01234567\n棍语言: -\n')
+        self.assertIsNotNone(self.encoder.search_history('01234567'))
+        self.assertIsNone(encoder.search_history('01234567'))
+
 def run_tests():
     """运行所有测试"""
     suite = unittest.TestLoader().loadTestsFromTestCase(TestGunEncoder)
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+棍语言共享存储测试套件
+Created by: ZLaoShi
+Last modified: 2026-10-19 00:00:00 UTC
+"""
+
+import multiprocessing
+import os
+import shutil
+import tempfile
+import unittest
+from gun_lang import GunEncoder
+from gun_store import GunStore, fcntl
+
+# 压力测试参数
+PROCESS_COUNT = 32
+TEXTS_PER_PROCESS = 20
+SHARED_TEXTS = [f"shared_{i}.txt" for i in range(TEXTS_PER_PROCESS)]
+
+
+def _worker(history_file: str, cache_file: str, worker_id: int):
+    """子进程：编码公共文本和私有文本并写入历史记录"""
+    encoder = GunEncoder(history_file, cache_file)
+    results = encoder.encode_batch(SHARED_TEXTS)
+    results.update(encoder.encode_batch(f"worker_{worker_id}_{i}" for i in range(TEXTS_PER_PROCESS)))
+    for text, (octal, gun_code) in results.items():
+        encoder.add_history(text, octal, gun_code)
+
+
+class TestGunStore(unittest.TestCase):
+    """测试多进程共享的编码缓存和历史记录"""
+
+    def setUp(self):
+        """每个测试前的设置"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.history_file = os.path.join(self.temp_dir, '.gun_history')
+        self.cache_file = os.path.join(self.temp_dir, '.gun_cache.db')
+
+    def tearDown(self):
+        """每个测试后的清理"""
+        shutil.rmtree(self.temp_dir)
+
+    def test_store_roundtrip(self):
+        """测试缓存读写"""
+        store = GunStore(self.cache_file)
+        self.assertEqual(store.get_many('md5-24', ['test']), {})
+        store.put_many('md5-24', [('test', '01234567', 'test_gun')])
+        store.put_many('md5-24', [('a', '1', 'I'), ('b', '2', 'l'), ('test', '0', ' ')])
+        found = store.get_many('md5-24', ['a', 'b', 'test', 'missing'])
+        self.assertEqual(found, {'a': ('1', 'I'), 'b': ('2', 'l'), 'test': ('01234567', 'test_gun')})
+        self.assertEqual(store.get_many('other', ['test']), {})
+        self.assertEqual(store.count(), 3)
+        store.close()
+
+    def test_store_is_bounded(self):
+        """测试超出上限时删除最早写入的记录"""
+        store = GunStore(self.cache_file, max_rows=10)
+        for i in range(5):
+            store.put_many('md5-24', [(f"t{i}_{j}", '0', ' ') for j in range(4)])
+        self.assertEqual(store.count(), 10)
+        self.assertEqual(store.get_many('md5-24', ['t0_0', 't4_3']), {'t4_3': ('0', ' ')})
+        store.close()
+
+    def test_encoder_uses_shared_cache(self):
+        """测试不同编码器共享缓存且结果与无缓存编码一致"""
+        first = GunEncoder(self.history_file, self.cache_file)
+        expected = GunEncoder(self.history_file).encode_text("测试文本.txt")
+        self.assertEqual(first.encode_text("测试文本.txt"), expected)
+
+        # 单个文本的编码只进入进程内缓存，批量编码才写入共享缓存
+        second = GunEncoder(self.history_file, self.cache_file)
+        self.assertEqual(second.store.get_many(second.scheme, ["测试文本.txt"]), {})
+        GunEncoder(self.history_file, self.cache_file).encode_batch(["测试文本.txt"])
+        self.assertEqual(second.store.get_many(second.scheme, ["测试文本.txt"]), {"测试文本.txt": expected})
+        self.assertEqual(second.encode_batch(["测试文本.txt"]), {"测试文本.txt": expected})
+
+    @unittest.skipIf(fcntl is None, "需要 fcntl 文件锁")
+    def test_concurrent_processes(self):
+        """压力测试：多个进程同时编码并写入历史记录"""
+        processes = [
+            multiprocessing.Process(target=_worker, args=(self.history_file, self.cache_file, i))
+            for i in range(PROCESS_COUNT)
+        ]
+        for p in processes:
+            p.start()
+        for p in processes:
+            p.join()
+            self.assertEqual(p.exitcode, 0)
+
+        # 每条历史记录都应完整，没有交错写入
+        with open(self.history_file, 'r', encoding='utf-8') as f:
+            records = f.read().split('---\n')[1:]
+        self.assertEqual(len(records), PROCESS_COUNT * TEXTS_PER_PROCESS * 2)
+        for record in records:
+            lines = record.splitlines()
+            self.assertEqual(len(lines), 5, record)
+            self.assertTrue(lines[0].startswith('时间: '))
+            self.assertTrue(lines[1].startswith('文本: '))
+            self.assertTrue(lines[2].startswith('八进制: '))
+            self.assertTrue(lines[3].startswith('棍语言: '))
+            self.assertEqual(lines[4], '方案: md5-24')
+
+        # 公共文本只缓存一次，且与直接编码结果一致
+        store = GunStore(self.cache_file)
+        self.assertEqual(store.count(), TEXTS_PER_PROCESS * (PROCESS_COUNT + 1))
+        encoder = GunEncoder(self.history_file)
+        found = store.get_many(encoder.scheme, SHARED_TEXTS)
+        for text in SHARED_TEXTS:
+            self.assertEqual(found[text], encoder.encode_text(text))
+        store.close()
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)